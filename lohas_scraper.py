@@ -3,10 +3,21 @@ import pandas as pd
 import os
 import time
 import random
+import numpy as np
 from datetime import datetime
 from tqdm import tqdm
 from services import YFinanceService, LohasService, SQLiteHandler, DB_PATH
 
+def build_score_rows(pending, today_str):
+    """Classify a batch of (sid, sname, price, bands) in one vectorized pass."""
+    prices = np.array([p[2] for p in pending])
+    bands = np.array([p[3] for p in pending])
+    levels = LohasService.get_lohas_levels(prices, bands)
+    return [
+        (sid, today_str, sname, int(level), price, *(round(float(b), 2) for b in row_bands))
+        for (sid, sname, price, row_bands), level in zip(pending, levels)
+    ]
+
 def run_score_scraper():
     # Configuration
     ticker_csv = os.path.join('data', 'stock_ticker.csv')
@@ -23,7 +34,7 @@ def run_score_scraper():
     yf_service = YFinanceService()
     db_handler = SQLiteHandler(DB_PATH)
     
-    results = []
+    pending = []
     failed_stocks = []
     
     print(f"Starting score calculation for {len(tickers_df)} stocks...")
@@ -40,20 +51,13 @@ def run_score_scraper():
                 clean_df = LohasService.prepare_data(df)
                 analysis = LohasService.calculate_five_lines(clean_df)
                 latest_price = clean_df['close'].iloc[-1]
-                level = LohasService.get_lohas_level(latest_price, analysis['lines'])
-                lines = analysis['lines']
-                results.append((
-                    sid, today_str, sname, level, latest_price,
-                    round(lines['+2SD'].iloc[-1], 2), round(lines['+1SD'].iloc[-1], 2),
-                    round(lines['Trend'].iloc[-1], 2), round(lines['-1SD'].iloc[-1], 2),
-                    round(lines['-2SD'].iloc[-1], 2)
-                ))
-                if len(results) >= 50:
-                    db_handler.save_scores(results); results = []
+                pending.append((sid, sname, latest_price, analysis['last_bands']))
+                if len(pending) >= 50:
+                    db_handler.save_scores(build_score_rows(pending, today_str)); pending = []
             else: failed_stocks.append(f"{sid} {sname}: Insufficient data or fetch failed")
         except Exception as e: failed_stocks.append(f"{sid} {sname}: Error {str(e)}")
 
-    if results: db_handler.save_scores(results)
+    if pending: db_handler.save_scores(build_score_rows(pending, today_str))
     print("\n" + "="*30)
     print(f"Scraping completed on {today_str}")
     print(f"Successfully processed: {len(tickers_df) - len(failed_stocks)}")
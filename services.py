@@ -2,13 +2,15 @@
 Stock Analysis Services
 """
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
 import pandas as pd
 import yfinance as yf
 import sqlite3
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 import numpy as np
-from sklearn.linear_model import LinearRegression
-from scipy.stats import norm
 import os
 import time
 import logging
@@ -23,6 +25,18 @@ EXCLUDED_INDUSTRIES = {'金融保險業'}
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+def build_http_session(pool_size: int = 4) -> requests.Session:
+    """requests.Session with keep-alive connection pooling and retries on transient 5xx."""
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+    session.mount('https://', HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry))
+    return session
+
+@lru_cache(maxsize=1)
+def _history_start(today: date) -> str:
+    """Start date (YYYY-MM-DD) of the ~3.5-year price window; cached per calendar day."""
+    return (today - timedelta(days=int(3.5 * 365))).strftime('%Y-%m-%d')
+
 class YFinanceService:
     """Responsible for yfinance stock price fetching"""
     
@@ -61,7 +75,7 @@ class YFinanceService:
     
     def fetch_data(self, ticker: str, market: str = None) -> pd.DataFrame | None:
         """Fetch historical stock data with smart suffix detection and error handling"""
-        start = (datetime.today() - timedelta(days=int(3.5 * 365))).strftime('%Y-%m-%d')
+        start = _history_start(date.today())
         max_retries = 3
         
         suffixes = ['.TW'] if market == '上市' else ['.TWO'] if market == '上櫃' else ['.TW', '.TWO']
@@ -81,7 +95,9 @@ class YFinanceService:
                             'Low': 'low', 'Close': 'close', 'Volume': 'Trading_Volume'
                         }, inplace=True)
                         
-                        df['date'] = df['date'].dt.strftime('%Y-%m-%d')
+                        # 先去掉時區（保留台北當地日期），再用 NumPy 一次轉成 'YYYY-MM-DD'；
+                        # 直接 .values 會換算成 UTC 而少一天
+                        df['date'] = df['date'].dt.tz_localize(None).to_numpy().astype('datetime64[D]').astype('U10')
                         df['stock_id'] = ticker
                         df[['open', 'high', 'low', 'close']] = df[['open', 'high', 'low', 'close']].round(2)
                         return df[['date', 'stock_id', 'Trading_Volume', 'open', 'high', 'low', 'close']]
@@ -101,34 +117,49 @@ class YFinanceService:
 
 class LohasService:
     """Responsible for LOHAS 5-Lines and Channel analysis calculations"""
+
+    # 五線順序與 stock_price_trend_lines 的 upper_2sd ... lower_2sd 欄位一致
+    FIVE_LINE_KEYS = ('+2SD', '+1SD', 'Trend', '-1SD', '-2SD')
     
     @staticmethod
     def prepare_data(stock_data: pd.DataFrame) -> pd.DataFrame:
-        df = stock_data.copy()
-        df['date'] = pd.to_datetime(df['date'])
-        df.set_index('date', inplace=True)
-        df = df[df['close'] != 0].dropna()
-        df['Date_ordinal'] = df.index.map(datetime.toordinal)
+        # drop/set_axis 已產生新物件，不需先 copy；也不會改到呼叫端的 DataFrame
+        idx = pd.DatetimeIndex(pd.to_datetime(stock_data['date'].to_numpy()), name='date')
+        df = stock_data.drop(columns='date').set_axis(idx)
+        df = df.loc[df['close'].to_numpy() != 0].dropna()
+        # 等同 datetime.toordinal：1970-01-01 的 ordinal 為 719163
+        df['Date_ordinal'] = df.index.to_numpy().astype('datetime64[D]').astype(np.int64) + 719163
         return df
     
     @staticmethod
     def calculate_five_lines(stock_data: pd.DataFrame) -> dict:
+        # sklearn / scipy.stats 匯入要將近一秒，只在真的計算五線譜時才載入；
+        # 財務總覽、市場情緒等頁面的冷啟動不必為此等待
+        from sklearn.linear_model import LinearRegression
+        from scipy.stats import norm
+
         X = stock_data['Date_ordinal'].values.reshape(-1, 1)
         Y = stock_data['close'].values
         model = LinearRegression().fit(X, Y)
-        stock_data['LR'] = model.predict(X)
+        lr = model.predict(X)
+        stock_data['LR'] = lr
         std_lr = (stock_data['close'] - stock_data['LR']).std()
         z69, z95 = norm.ppf((1 + 0.69) / 2), norm.ppf((1 + 0.95) / 2)
+
+        # 五條線一次廣播成 (N, 5) 矩陣（FIVE_LINE_KEYS 順序）；lines 內的 Series 只是各欄的 view
+        offsets = np.array([z95, z69, 0.0, -z69, -z95]) * std_lr
+        bands = lr[:, None] + offsets[None, :]
+        lines = {
+            k: pd.Series(bands[:, i], index=stock_data.index, name=k, copy=False)
+            for i, k in enumerate(LohasService.FIVE_LINE_KEYS)
+        }
         
         return {
             'data': stock_data, 'std': std_lr, 'z69': z69, 'z95': z95,
-            'lines': {
-                '+2SD': stock_data['LR'] + z95 * std_lr,
-                '+1SD': stock_data['LR'] + z69 * std_lr,
-                '-1SD': stock_data['LR'] - z69 * std_lr,
-                '-2SD': stock_data['LR'] - z95 * std_lr,
-                'Trend': stock_data['LR'],
-            }
+            'bands': bands,
+            'lines': lines,
+            # 最新一天的五線值，供位階判斷與寫入 DB
+            'last_bands': bands[-1],
         }
     
     @staticmethod
@@ -146,19 +177,20 @@ class LohasService:
         }
 
     @staticmethod
-    def get_lohas_level(price: float, lines: dict) -> int:
-        trend = lines['Trend'].iloc[-1]
-        p1sd = lines['+1SD'].iloc[-1]
-        p2sd = lines['+2SD'].iloc[-1]
-        m1sd = lines['-1SD'].iloc[-1]
-        m2sd = lines['-2SD'].iloc[-1]
+    def get_lohas_levels(prices: np.ndarray, bands: np.ndarray) -> np.ndarray:
+        """Vectorized LOHAS level (1~6) for N prices against an (N, 5) band matrix.
+
+        The level is 1 + the number of lines the price is at or above, so the
+        column order of `bands` does not matter.
+        """
+        prices = np.asarray(prices, dtype=float)
+        bands = np.asarray(bands, dtype=float)
+        return (prices[:, None] >= bands).sum(axis=1) + 1
 
-        if price < m2sd: return 1
-        elif price < m1sd: return 2
-        elif price < trend: return 3
-        elif price < p1sd: return 4
-        elif price < p2sd: return 5
-        return 6
+    @staticmethod
+    def get_lohas_level(price: float, bands: np.ndarray) -> int:
+        """LOHAS level (1~6) of one price against `last_bands` from calculate_five_lines."""
+        return 1 + int((price >= np.asarray(bands)).sum())
 
 
 class EconomyService:
@@ -169,22 +201,28 @@ class EconomyService:
         'Accept': 'application/json',
         'Referer': 'https://www.cnn.com/markets/fear-and-greed'
     }
+    # 整個 process 共用一個連線，重複刷新時不必每次重新做 TCP/TLS 握手。
+    # 唯一的呼叫端 get_fear_greed_data_cached 由 st.cache_data 以每個快取鍵一把鎖計算，不會同時使用這個 Session
+    _session = build_http_session(pool_size=1)
 
     @staticmethod
     def fetch_fear_greed_index() -> dict | None:
         try:
             start_date = (datetime.today() - timedelta(days=366)).strftime('%Y-%m-%d')
             url = f"{EconomyService.CNN_GRAPH_URL}{start_date}"
-            response = requests.get(url, headers=EconomyService.HEADERS, timeout=10)
+            response = EconomyService._session.get(url, headers=EconomyService.HEADERS, timeout=10)
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 fear_greed = data.get('fear_and_greed', {})
                 historical = data.get('fear_and_greed_historical', {}).get('data', [])
-                df_history = pd.DataFrame(historical)
-                if not df_history.empty:
-                    df_history['x'] = pd.to_datetime(df_history['x'], unit='ms')
-                    df_history.rename(columns={'x': 'date', 'y': 'score'}, inplace=True)
-                    df_history = df_history.sort_values('date')
+                # 直接組成 NumPy 陣列（x 為毫秒時間戳），不經 list-of-dict 的 DataFrame 推斷
+                n = len(historical)
+                dates = np.fromiter((p['x'] for p in historical), dtype=np.int64, count=n).astype('datetime64[ms]')
+                scores = np.fromiter((p['y'] for p in historical), dtype=float, count=n)
+                if n > 1 and (np.diff(dates) < np.timedelta64(0, 'ms')).any():
+                    order = np.argsort(dates, kind='stable')
+                    dates, scores = dates[order], scores[order]
+                df_history = pd.DataFrame({'date': dates, 'score': scores})
                 return {
                     'current_score': fear_greed.get('score', 0),
                     'current_rating': fear_greed.get('rating', 'Neutral').title(),
@@ -201,6 +239,10 @@ class EconomyService:
 
 
 class SQLiteHandler:
+    # 固定 schema 查詢中的數值欄位（REAL），直接指定 dtype，不讓 pandas 逐欄推斷
+    HISTORY_FLOAT_COLS = ('營收年增率', '營業利益率', '稅後淨利年增率', '每股盈餘EPS', '自由現金流量', '本期綜合評分', '綜合評分變化')
+    OVERVIEW_FLOAT_COLS = ('總分', '樂活五線譜', '月營收評分', '營業利益率評分', '淨利成長評分', 'EPS評分', '自由現金流量評分')
+
     def __init__(self, db_path=DB_PATH):
         self.db_path = db_path
         self._init_db()
@@ -245,6 +287,14 @@ class SQLiteHandler:
         conn.commit()
         conn.close()
 
+    @staticmethod
+    def _query_frame(conn, query, params=(), float_cols=()) -> pd.DataFrame:
+        """Run a fixed-schema SELECT via the cursor and build the DataFrame from the raw rows."""
+        cursor = conn.execute(query, params)
+        columns = [d[0] for d in cursor.description]
+        df = pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+        return df.astype({c: 'float64' for c in float_cols if c in df.columns})
+
     def save_scores(self, data_list):
         if not data_list: return
         conn = sqlite3.connect(self.db_path)
@@ -286,7 +336,7 @@ class SQLiteHandler:
         conn = sqlite3.connect(self.db_path)
         try:
             query = "SELECT * FROM stock_financial_scores WHERE stock_id = ? ORDER BY 營收月份 DESC"
-            return pd.read_sql_query(query, conn, params=(str(stock_id),))
+            return self._query_frame(conn, query, (str(stock_id),), self.HISTORY_FLOAT_COLS)
         except Exception as e:
             logger.error(f"Error fetching financial history: {e}")
             return pd.DataFrame()
@@ -322,7 +372,7 @@ class SQLiteHandler:
             WHERE f.rn = 1
             ORDER BY f.stock_id ASC
             """
-            return pd.read_sql_query(query, conn)
+            return self._query_frame(conn, query, float_cols=self.OVERVIEW_FLOAT_COLS)
         except Exception as e:
             logger.error(f"Error fetching financial overview: {e}")
             return pd.DataFrame()
@@ -6,11 +6,21 @@ from view import AppView
 from financial_scraper import FinancialScorer
 
 # --- Initialize Services ---
-yfinance_service = YFinanceService()
+# 有狀態的服務（載入 CSV、初始化 DB）每個 process 只建一次，避免每次 rerun 重做
+@st.cache_resource
+def get_yf_service():
+    return YFinanceService()
+
+@st.cache_resource
+def get_sqlite_handler():
+    return SQLiteHandler() # Uses default DB_PATH
+
+yfinance_service = get_yf_service()
 lohas_service = LohasService()
 economy_service = EconomyService()
+# StockScraper 內有無上限的 soup 快取，跨 session 共用會讓 analyze_stock_detailed_cached 的 TTL 失效
 financial_scorer = FinancialScorer()
-sqlite_handler = SQLiteHandler() # Uses default DB_PATH
+sqlite_handler = get_sqlite_handler()
 app_view = AppView()
 
 # --- Cached Data Fetching ---
@@ -22,9 +32,26 @@ def get_stock_info_cached(target: str) -> dict | None:
 def fetch_data_cached(ticker: str, market: str = None):
     return yfinance_service.fetch_data(ticker, market)
 
+@st.cache_data(ttl=3600)
+def analyze_lohas_cached(ticker: str, market: str = None):
+    # 迴歸、滾動統計與頁首指標字串一起快取：同一檔股票 rerun 或在個股頁/六大指標頁之間切換時不必重算
+    stock_data = fetch_data_cached(ticker, market)
+    if stock_data is None:
+        return None
+    stock_data = LohasService.prepare_data(stock_data)
+    return {
+        'stock_data': stock_data,
+        'five_lines_data': LohasService.calculate_five_lines(stock_data),
+        'channel_data': LohasService.calculate_channel(stock_data),
+        'metrics': AppView.format_metrics(
+            stock_data['close'].iloc[-1], ticker, stock_data.index[-1].strftime('%Y-%m-%d')
+        ),
+    }
+
 @st.cache_data(ttl=3600)
 def get_financial_overview_cached():
-    return sqlite_handler.get_financial_overview()
+    # 搜尋用的小寫欄位隨資料一起快取，輸入查詢的 rerun 不必重新整欄轉型
+    return AppView.prepare_overview(sqlite_handler.get_financial_overview())
 
 @st.cache_data(ttl=3600)
 def analyze_stock_detailed_cached(ticker: str):
@@ -56,20 +83,11 @@ if current_page == "individual":
         with st.spinner('分析計算中…'):
             info = get_stock_info_cached(target)
             if info:
-                sid = info['id']
-                market = info['market']
-                stock_data = fetch_data_cached(sid, market)
+                lohas = analyze_lohas_cached(info['id'], info['market'])
                 
-                if stock_data is not None:
-                    stock_data = LohasService.prepare_data(stock_data)
-                    five_lines_data = LohasService.calculate_five_lines(stock_data)
-                    channel_data = LohasService.calculate_channel(stock_data)
-                    
-                    now_p = stock_data['close'].iloc[-1]
-                    last_date = stock_data.index[-1].strftime('%Y-%m-%d')
-                    
-                    AppView.render_metrics(now_p, sid, last_date)
-                    AppView.render_tabs(stock_data, five_lines_data, channel_data)
+                if lohas is not None:
+                    AppView.render_metrics(lohas['metrics'])
+                    AppView.render_tabs(lohas['stock_data'], lohas['five_lines_data'], lohas['channel_data'])
                 else:
                     st.error("資料讀取失敗。")
             else:
@@ -121,16 +139,7 @@ elif current_page == "financials_six_index":
                     lohas_bundle = None
                     info = get_stock_info_cached(ticker)
                     if info:
-                        stock_data = fetch_data_cached(info['id'], info['market'])
-                        if stock_data is not None:
-                            stock_data = LohasService.prepare_data(stock_data)
-                            five_lines_data = LohasService.calculate_five_lines(stock_data)
-                            channel_data = LohasService.calculate_channel(stock_data)
-                            lohas_bundle = {
-                                'stock_data': stock_data,
-                                'five_lines_data': five_lines_data,
-                                'channel_data': channel_data
-                            }
+                        lohas_bundle = analyze_lohas_cached(info['id'], info['market'])
                     
                     if results and results.get('總分') != "無法評分":
                         AppView.render_financial_dashboard(
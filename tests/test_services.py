@@ -0,0 +1,152 @@
+"""
+Unit tests for LohasService's pure calculations and EconomyService's response
+parsing (no network / yfinance; the HTTP session is stubbed).
+
+Run:  pytest tests/test_services.py -v
+"""
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+import orjson
+import pandas as pd
+import pytest
+
+from services import EconomyService, LohasService
+
+# One row of lines in FIVE_LINE_KEYS order: +2SD, +1SD, Trend, -1SD, -2SD
+BANDS = [140.0, 120.0, 100.0, 80.0, 60.0]
+
+
+@pytest.fixture
+def sample_stock_data():
+    """200 days of an upward trend with a sine wobble, as returned by prepare_data."""
+    dates = pd.date_range("2023-01-01", periods=200, freq="D")
+    close = 100 + 0.1 * np.arange(200) + 5 * np.sin(np.arange(200))
+    return LohasService.prepare_data(pd.DataFrame({"date": dates.strftime("%Y-%m-%d"), "close": close}))
+
+
+class TestLohasLevel:
+    @pytest.mark.parametrize("price,expected", [
+        (50,    1),   # below -2SD
+        (60,    2),   # on -2SD counts as at/above it
+        (70,    2),
+        (90,    3),
+        (100,   4),   # on Trend
+        (130,   5),
+        (140,   6),   # on +2SD
+        (200,   6),
+    ])
+    def test_single_price(self, price, expected):
+        assert LohasService.get_lohas_level(price, np.array(BANDS)) == expected
+
+    def test_batch_matches_single(self):
+        prices = np.array([50, 70, 90, 110, 130, 150], dtype=float)
+        bands = np.tile(BANDS, (len(prices), 1))
+        levels = LohasService.get_lohas_levels(prices, bands)
+        assert levels.tolist() == [1, 2, 3, 4, 5, 6]
+        assert levels.tolist() == [LohasService.get_lohas_level(p, BANDS) for p in prices]
+
+    def test_band_column_order_is_irrelevant(self):
+        prices = np.array([90.0, 130.0])
+        bands = np.array([BANDS, BANDS[::-1]])
+        assert LohasService.get_lohas_levels(prices, bands).tolist() == [3, 5]
+
+
+class TestFiveLines:
+    def test_last_bands_match_lines(self, sample_stock_data):
+        result = LohasService.calculate_five_lines(sample_stock_data)
+        expected = [result["lines"][k].iloc[-1] for k in LohasService.FIVE_LINE_KEYS]
+        np.testing.assert_allclose(result["last_bands"], expected)
+        assert list(result["last_bands"]) == sorted(result["last_bands"], reverse=True)
+
+    def test_bands_matrix_columns(self, sample_stock_data):
+        data = sample_stock_data
+        result = LohasService.calculate_five_lines(data)
+        z69, z95, std = result["z69"], result["z95"], result["std"]
+        assert result["bands"].shape == (len(data), 5)
+        np.testing.assert_allclose(result["lines"]["Trend"], data["LR"])
+        np.testing.assert_allclose(result["lines"]["+2SD"], data["LR"] + z95 * std)
+        np.testing.assert_allclose(result["lines"]["-1SD"], data["LR"] - z69 * std)
+
+
+class TestPrepareData:
+    @pytest.fixture
+    def raw(self):
+        """Raw fetch_data output: string dates, with a zero close and a NaN close mixed in."""
+        return pd.DataFrame({
+            "date": ["2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05", "2024-01-08"],
+            "close": [100.0, 0.0, 101.5, np.nan, 99.0],
+            "stock_id": ["2330"] * 5,
+        })
+
+    def test_date_ordinal_matches_toordinal(self, raw):
+        df = LohasService.prepare_data(raw)
+        assert df["Date_ordinal"].tolist() == df.index.map(datetime.toordinal).tolist()
+        assert df["Date_ordinal"].dtype == np.int64
+
+    def test_drops_zero_and_nan_closes(self, raw):
+        df = LohasService.prepare_data(raw)
+        assert isinstance(df.index, pd.DatetimeIndex) and df.index.name == "date"
+        assert df.index.strftime("%Y-%m-%d").tolist() == ["2024-01-02", "2024-01-04", "2024-01-08"]
+        assert df["close"].tolist() == [100.0, 101.5, 99.0]
+        assert "date" not in df.columns
+
+    def test_input_is_not_mutated(self, raw):
+        before = raw.copy()
+        LohasService.prepare_data(raw)
+        pd.testing.assert_frame_equal(raw, before)
+
+
+class TestFearGreedParsing:
+    @staticmethod
+    def fetch(monkeypatch, historical):
+        """Run fetch_fear_greed_index against a canned CNN payload."""
+        payload = {
+            "fear_and_greed": {"score": 42.0, "rating": "fear", "previous_close": 40.0},
+            "fear_and_greed_historical": {"data": historical},
+        }
+        response = SimpleNamespace(status_code=200, content=orjson.dumps(payload))
+        monkeypatch.setattr(EconomyService, "_session", SimpleNamespace(get=lambda *a, **k: response))
+        result = EconomyService.fetch_fear_greed_index()
+        assert result is not None
+        return result
+
+    def test_sorted_history(self, monkeypatch):
+        result = self.fetch(monkeypatch, [
+            {"x": 1704067200000, "y": 30.0},   # 2024-01-01
+            {"x": 1704153600000, "y": 35.5},   # 2024-01-02
+        ])
+        hist = result["historical_data"]
+        assert hist["date"].dtype == "datetime64[ms]"
+        assert hist["score"].dtype == np.float64
+        assert hist["date"].dt.strftime("%Y-%m-%d").tolist() == ["2024-01-01", "2024-01-02"]
+        assert hist["score"].tolist() == [30.0, 35.5]
+        assert result["current_rating"] == "Fear"
+
+    def test_out_of_order_history_is_sorted(self, monkeypatch):
+        hist = self.fetch(monkeypatch, [
+            {"x": 1704240000000, "y": 50.0},   # 2024-01-03
+            {"x": 1704067200000, "y": 30.0},   # 2024-01-01
+            {"x": 1704153600000, "y": 40.0},   # 2024-01-02
+        ])["historical_data"]
+        assert hist["date"].is_monotonic_increasing
+        assert hist["date"].dt.strftime("%Y-%m-%d").tolist() == ["2024-01-01", "2024-01-02", "2024-01-03"]
+        # scores are reordered together with their dates
+        assert hist["score"].tolist() == [30.0, 40.0, 50.0]
+
+    def test_float_timestamps(self, monkeypatch):
+        hist = self.fetch(monkeypatch, [
+            {"x": 1704067200000.0, "y": 30},
+            {"x": 1704153600000.0, "y": 40},
+        ])["historical_data"]
+        assert hist["date"].dtype == "datetime64[ms]"
+        assert hist["date"].tolist() == [pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-02")]
+        assert hist["score"].dtype == np.float64
+
+    def test_empty_history_keeps_columns(self, monkeypatch):
+        hist = self.fetch(monkeypatch, [])["historical_data"]
+        assert hist.empty
+        assert list(hist.columns) == ["date", "score"]
+        assert hist["date"].dtype == "datetime64[ms]"
+        assert hist["score"].dtype == np.float64
@@ -0,0 +1,71 @@
+"""
+Unit tests for ticker_scraper's CSV writer (no network).
+
+_write_csv must produce exactly the bytes of
+to_csv(encoding='utf-8-sig', index=False), whichever writer it picks.
+
+Run:  pytest tests/test_ticker_scraper.py -v
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import ticker_scraper
+from ticker_scraper import _write_csv
+
+
+def to_csv_bytes(df, tmp_path):
+    path = tmp_path / "expected.csv"
+    df.to_csv(path, encoding="utf-8-sig", index=False)
+    return path.read_bytes()
+
+
+def write_csv_bytes(df, tmp_path):
+    path = tmp_path / "actual.csv"
+    _write_csv(df, path)
+    return path.read_bytes()
+
+
+@pytest.fixture
+def ticker_df():
+    """Same schema as run_scraper's output: all string columns, list_date may be missing."""
+    return pd.DataFrame({
+        "list_date": pd.array(["1962-02-09", None, "2003-12-25"], dtype="str"),
+        "market": pd.array(["上市", "上市", "上櫃"], dtype="str"),
+        "industry": pd.array(["水泥工業", "半導體業", "電子零組件業"], dtype="str"),
+        "代號": pd.array(["1101", "2330", "3105"], dtype="str"),
+        "名稱": pd.array(["台泥", "台積電", "穩懋"], dtype="str"),
+    })
+
+
+@pytest.mark.skipif(ticker_scraper.pa is None, reason="pyarrow not installed")
+def test_string_schema_uses_pyarrow(ticker_df, tmp_path, monkeypatch):
+    expected = to_csv_bytes(ticker_df, tmp_path)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("string-only frame should not fall back to to_csv")
+
+    monkeypatch.setattr(pd.DataFrame, "to_csv", fail)
+    assert write_csv_bytes(ticker_df, tmp_path) == expected
+
+
+def test_string_schema_matches_to_csv(ticker_df, tmp_path):
+    assert write_csv_bytes(ticker_df, tmp_path) == to_csv_bytes(ticker_df, tmp_path)
+
+
+@pytest.mark.parametrize("name", ["台積電, 特別股", 'say "hi"', "兩\n行"])
+def test_values_needing_quotes_fall_back(ticker_df, tmp_path, name):
+    ticker_df.loc[1, "名稱"] = name
+    assert write_csv_bytes(ticker_df, tmp_path) == to_csv_bytes(ticker_df, tmp_path)
+
+
+def test_mixed_object_column(tmp_path):
+    # pa.Table.from_pandas raises ArrowTypeError on this column
+    df = pd.DataFrame({"a": ["1101", 2330]})
+    assert write_csv_bytes(df, tmp_path) == to_csv_bytes(df, tmp_path)
+
+
+def test_float_column(tmp_path):
+    # pyarrow would write 1 where to_csv writes 1.0
+    df = pd.DataFrame({"代號": ["1101", "2330"], "score": [1.0, np.nan]})
+    assert write_csv_bytes(df, tmp_path) == to_csv_bytes(df, tmp_path)
@@ -1,8 +1,49 @@
-import requests
+import numpy as np
 import pandas as pd
-from bs4 import BeautifulSoup
-from io import StringIO
+from pandas.api.types import is_string_dtype
+from io import BytesIO, StringIO
+from concurrent.futures import ThreadPoolExecutor
+import codecs
 import os
+import threading
+from services import build_http_session
+
+try:
+    # pyarrow 隨 streamlit 安裝；沒有時退回 pandas 的 to_csv
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+
+# requests.Session 不保證可跨執行緒共用，每個下載執行緒各自保留一個（keep-alive + 重試）
+_thread_local = threading.local()
+
+def _fetch(url):
+    session = getattr(_thread_local, 'session', None)
+    if session is None:
+        session = _thread_local.session = build_http_session(pool_size=1)
+    return session.get(url, timeout=15)
+
+def _write_csv(df, path):
+    """
+    以 pyarrow 的 C++ CSV writer 輸出 UTF-8 BOM 檔案；全部欄位都是字串時（爬蟲的輸出），
+    內容與 to_csv(encoding='utf-8-sig', index=False) 相同。
+    含非字串欄位（例如 pyarrow 把 1.0 寫成 1）、或欄位值需要加引號（逗號、引號、換行）時改用 to_csv。
+    """
+    if pa is not None and all(is_string_dtype(df[col]) for col in df.columns):
+        try:
+            buf = BytesIO()
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            pa_csv.write_csv(table, buf, pa_csv.WriteOptions(include_header=False, quoting_style='none'))
+        except pa.ArrowException:
+            pass
+        else:
+            # 表頭自行寫出：pyarrow 一律替表頭加引號，to_csv 則不會
+            header = (','.join(map(str, df.columns)) + '\n').encode('utf-8')
+            with open(path, 'wb') as f:
+                f.write(codecs.BOM_UTF8 + header + buf.getvalue())
+            return
+    df.to_csv(path, encoding='utf-8-sig', index=False)
 
 def run_scraper():
     """
@@ -21,14 +62,17 @@ def run_scraper():
         "https://isin.twse.com.tw/isin/C_public.jsp?strMode=4"   # 上櫃
     ]
 
-    combined_df = pd.DataFrame()
+    frames = []
+
+    # 上市、上櫃兩頁同時下載，讓兩次網路等待重疊；解析仍依原順序進行
+    with ThreadPoolExecutor(max_workers=len(urls)) as ex:
+        futures = [ex.submit(_fetch, url) for url in urls]
 
-    for url in urls:
+    for url, future in zip(urls, futures):
         try:
-            response = requests.get(url, timeout=15)
-            soup = BeautifulSoup(response.text, 'lxml')
-            table = soup.find_all('table')[1]
-            df = pd.read_html(StringIO(str(table)), header=0)[0]
+            response = future.result()
+            # 單次 lxml 解析，直接以表頭文字挑出資料表（找不到時 read_html 會拋 ValueError）
+            df = pd.read_html(StringIO(response.text), match='有價證券代號及名稱', header=0, flavor='lxml')[0]
 
             # 清理 DataFrame
             df.rename(columns={'有價證券代號及名稱': 'code_and_name', '市場別': 'market', '產業別': 'industry', '上市日': 'list_date'}, inplace=True)
@@ -36,21 +80,25 @@ def run_scraper():
             df = df[df['market'].isin(['上市', '上櫃'])]
             
             # 分割代號和名稱
-            df['代號'] = df['code_and_name'].apply(lambda x: x.split()[0] if len(x.split()) > 0 else '')
-            df['名稱'] = df['code_and_name'].apply(lambda x: " ".join(x.split()[1:]) if len(x.split()) > 1 else '')
+            parts = df['code_and_name'].str.split(n=1, expand=True).reindex(columns=[0, 1])
+            df['代號'] = parts[0].fillna('')
+            df['名稱'] = parts[1].fillna('').str.replace(r'\s+', ' ', regex=True).str.strip()
             
-            df = df[df['代號'].apply(lambda x: str(x).isdigit())]
+            df = df[df['代號'].str.isdigit()]
             df = df.drop(columns=['code_and_name'])
-            df['list_date'] = pd.to_datetime(df['list_date'], format='%Y/%m/%d', errors='coerce').dt.strftime('%Y-%m-%d')
-            combined_df = pd.concat([combined_df, df], ignore_index=True)
+            # 以 numpy 一次把日期轉成 YYYY-MM-DD 字串，取代逐列 strftime；無法解析的日期維持空值
+            list_date = pd.to_datetime(df['list_date'], format='%Y/%m/%d', errors='coerce', cache=True)
+            date_str = np.datetime_as_string(list_date.to_numpy().astype('datetime64[D]'), unit='D')
+            df['list_date'] = pd.Series(date_str, index=df.index).where(list_date.notna())
+            frames.append(df)
         except Exception as e:
             print(f"Failed to process url {url}. Error: {e}")
             continue
 
+    combined_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
     if not combined_df.empty:
-        combined_df = combined_df.reset_index(drop=True)
         print(f"Scraping complete. Saving to {output_file}...")
-        combined_df.to_csv(output_file, encoding='utf-8-sig', index=False)
+        _write_csv(combined_df, output_file)
         print("File saved successfully.")
     else:
         print("No data was scraped. The output file was not created.")
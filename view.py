@@ -4,13 +4,117 @@ Streamlit UI components for the stock analysis dashboard.
 from __future__ import annotations
 
 import html
+from functools import lru_cache
+from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 
 
+@lru_cache(maxsize=1)
+def _app_css() -> str:
+    """全站樣式放在 view_styles.css；讀檔並包成 <style> 一次，之後每次 rerun 直接重用。"""
+    css = Path(__file__).with_name("view_styles.css").read_text(encoding="utf-8")
+    return f"<style>\n{css}</style>\n"
+
+
+# 恐懼與貪婪指數分級區間（右端含等號）
+_FG_BINS = [-np.inf, 25, 45, 55, 75, np.inf]
+_FG_RATINGS = ["Extreme Fear", "Fear", "Neutral", "Greed", "Extreme Greed"]
+
+# 市場情緒「歷史數值」的單列卡片
+_FG_ROW_TEMPLATE = (
+    '<div class="metric-card" style="min-height:auto;margin-bottom:10px;">'
+    '<div style="display:flex;justify-content:space-between;gap:12px;align-items:center;">'
+    '<div><div class="metric-card-label">{label}</div>'
+    '<div style="margin-top:4px;font-weight:700;color:{color};">{rating}</div></div>'
+    '<div style="font-size:24px;font-weight:700;color:{color};">{value}</div>'
+    "</div></div>"
+)
+
+# 查無股票訊息：只有搜尋字串會變，前後段固定
+_NOT_FOUND_PREFIX = '<div class="soft-message"><p class="soft-message-title">找不到「'
+_NOT_FOUND_SUFFIX = '」</p><p class="soft-message-copy">請確認股票代號或公司名稱後再試一次。</p></div>'
+
+
+# 各頁面所屬的導覽分類，用來高亮標示
+_NAV_CATEGORIES = {
+    "individual": "technical",
+    "financials_six_index": "financials",
+    "financials_overview": "financials",
+    "economy": "economy",
+}
+
+
+# current_page 來自網址 ?page=，呼叫端先把未知頁面收斂成 ""；maxsize 再設上限，快取不會被任意參數撐大
+@lru_cache(maxsize=8)
+def _nav_html(current_page: str) -> str:
+    """導覽列 HTML；只隨 current_page 變化，每個頁面組一次即可。"""
+    active_cat = _NAV_CATEGORIES.get(current_page, "")
+
+    def nav(cat):
+        return "nav-link active" if cat == active_cat else "nav-link"
+
+    def item(page):
+        return "dropdown-item active" if page == current_page else "dropdown-item"
+
+    return f"""
+        <div class="apple-nav">
+            <ul class="nav-list">
+                <li class="nav-item">
+                    <a class="{nav('technical')}" href="#"><span class="nav-kicker"></span>技術面</a>
+                    <div class="dropdown-menu">
+                        <a href="?page=individual" target="_self" class="{item('individual')}">樂活五線譜</a>
+                    </div>
+                </li>
+                <li class="nav-item">
+                    <a class="{nav('financials')}" href="#"><span class="nav-kicker"></span>財務面</a>
+                    <div class="dropdown-menu">
+                         <a href="?page=financials_six_index" target="_self" class="{item('financials_six_index')}">六大指標評分</a>
+                         <a href="?page=financials_overview" target="_self" class="{item('financials_overview')}">財務總覽</a>
+                    </div>
+                </li>
+                <li class="nav-item">
+                    <a class="{nav('economy')}" href="#"><span class="nav-kicker"></span>總經面</a>
+                    <div class="dropdown-menu">
+                        <a href="?page=economy" target="_self" class="{item('economy')}">Fear &amp; Greed Index</a>
+                    </div>
+                </li>
+            </ul>
+        </div>
+        """
+
+
+# 參數加底線前綴：不雜湊整份歷史資料，只以 key（見 AppView._history_key）判斷是否命中
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def _prepare_history(key: tuple, _history_df: pd.DataFrame) -> tuple[pd.DataFrame | None, pd.DataFrame]:
+    """歷史評分的圖表資料（月份、分數，依月份排序）與表格資料（改名、挑欄）只在資料變動時整理一次。"""
+    history_df = _history_df
+    month_col = AppView._first_existing(history_df, ["營收月份", "Month"])
+    score_col = AppView._first_existing(history_df, ["本期綜合評分", "總分", "Total Score"])
+    plot = history_df[[month_col, score_col]].sort_values(month_col) if month_col and score_col else None
+
+    # rename 本來就會略過不存在的欄位，不必先逐一比對
+    table = history_df.rename(columns=AppView.HISTORY_RENAME)
+    present = set(table.columns)
+    cols = [c for c in AppView.HISTORY_COLUMNS if c in present]
+    return plot, table[cols] if cols else table
+
+
+# 參數加底線前綴：Streamlit 不雜湊整份資料，只以 key（見 AppView._figure_key）判斷是否命中
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def _cached_figure(kind: str, key: tuple, _args: tuple) -> dict:
+    """建好的圖表以 dict 快取（由 AppView._build_<kind>_fig 產生）；切換分頁或其他輸入造成的 rerun 不再重建 trace。"""
+    fig = getattr(AppView, f"_build_{kind}_fig")(*_args).to_dict()
+    # to_dict() 會把整份預設 template 展開進 layout，而 st.plotly_chart 每次 rerun 都會把 dict 重新建成 Figure 並驗證；
+    # 不帶 template 時 Plotly 直接套用同一個（已快取的）預設 template，輸出相同但省去大半驗證
+    fig["layout"].pop("template", None)
+    return fig
+
+
 class AppView:
     """Render Streamlit screens with a restrained, consistent visual system."""
 
@@ -27,412 +131,149 @@ class AppView:
     # Plotly 圖表字型堆疊（含中文字型，與主 CSS 一致）
     FONT = 'Inter, "Noto Sans TC", "PingFang TC", "Microsoft JhengHei", sans-serif'
 
+    # 恐懼與貪婪分級對應的文字顏色
+    FG_RATING_COLORS = {
+        "Extreme Fear": RED,
+        "Fear": RED,
+        "Neutral": TEXT,
+        "Greed": GREEN,
+        "Extreme Greed": GREEN,
+    }
+
+    # 六大指標明細表：(選項名稱, raw_data 鍵, 各欄候選欄名, 顯示欄名, 無資料訊息)
+    FINANCIAL_TABLES = (
+        ("月營收", "revenue", [["date"], ["revenue"], ["yoy"]], ["月份", "營收(千元)", "年增率(%)"], "查無營收資料。"),
+        ("營業利益率", "profitability", [["quarter"], ["營業利益率"]], ["季度", "營業利益率(%)"], "查無營業利益率資料。"),
+        ("淨利成長率", "profitability", [["quarter"], ["稅後淨利成長率", "稅後淨利年增率"]], ["季度", "淨利成長率(%)"], "查無淨利成長資料。"),
+        ("EPS", "profitability", [["quarter"], ["每股盈餘", "每股盈餘EPS"]], ["季度", "EPS(元)"], "查無 EPS 資料。"),
+        ("存貨周轉率", "profitability", [["quarter"], ["存貨週轉率(次)", "存貨周轉率"]], ["季度", "存貨周轉率"], "查無存貨周轉率資料。"),
+        ("自由現金流量", "cashflow", [["quarter"], ["fcf"]], ["季度", "自由現金流量"], "查無現金流量資料。"),
+    )
+
+    # 歷史評分表：DB 欄名 → 顯示欄名，以及顯示順序
+    HISTORY_RENAME = {
+        "營收月份": "營收月份",
+        "財報季度": "財報季度",
+        "本期綜合評分": "綜合評分",
+        "綜合評分變化": "評分變化",
+        "營收年增率": "月營收",
+        "營業利益率": "營業利益率",
+        "稅後淨利年增率": "淨利成長",
+        "每股盈餘EPS": "EPS",
+        "存貨周轉率": "存貨周轉",
+        "自由現金流量": "自由現金流",
+    }
+    HISTORY_COLUMNS = ["營收月份", "財報季度", "綜合評分", "評分變化", "月營收", "營業利益率", "淨利成長", "EPS", "存貨周轉", "自由現金流"]
+    # 表格欄位設定在類別載入時建立一次；st.dataframe 會自行 deepcopy，不會改到這些常數
+    HISTORY_COLUMN_CONFIG = {
+        "綜合評分": st.column_config.NumberColumn("綜合評分", format="%.2f", width="small"),
+        "評分變化": st.column_config.NumberColumn("評分變化", format="%+.2f"),
+    }
+
+    # 財務總覽每頁筆數
+    OVERVIEW_PAGE_SIZE = 100
+    # 分頁時的伺服器端排序：顯示名稱 -> 原始欄位。表頭點擊排序只在瀏覽器端排目前這一頁
+    OVERVIEW_SORT_OPTIONS = {
+        "代號": "代號",
+        "綜合評分": "總分",
+        "樂活位階": "樂活五線譜",
+        "月營收": "月營收評分",
+        "營業利益率": "營業利益率評分",
+        "淨利成長": "淨利成長評分",
+        "EPS": "EPS評分",
+        "存貨周轉": "存貨周轉率評分",
+        "自由現金流": "自由現金流量評分",
+    }
+    OVERVIEW_SCORE_COLUMNS = ["綜合評分", "月營收", "營業利益率", "淨利成長", "EPS", "自由現金流"]
+    OVERVIEW_COLUMN_CONFIG = {
+        "代號": st.column_config.TextColumn("代號", width="small"),
+        "名稱": st.column_config.TextColumn("名稱", width="medium"),
+        "產業": st.column_config.TextColumn("產業", width="medium"),
+        "樂活位階": st.column_config.TextColumn("樂活位階", width="small"),
+        **{
+            col_name: st.column_config.NumberColumn(col_name, format="%.2f", width="small")
+            for col_name in OVERVIEW_SCORE_COLUMNS
+        },
+    }
+
+    # 圖表共用的樣式設定：類別載入時建立一次，各圖表直接套用（Plotly 會複製內容，不會改到這些常數）
+    HOVER = "<b>%{fullData.name}</b>: %{y:.2f}<extra></extra>"
+    PLOT_CONFIG = {"displayModeBar": False, "responsive": True}
+    CHART_LAYOUT = dict(
+        showlegend=False,
+        plot_bgcolor="#ffffff",
+        paper_bgcolor="#ffffff",
+        margin=dict(l=12, r=12, t=24, b=12),
+        font=dict(family=FONT, color=TEXT, size=12),
+        hovermode="x unified",
+        hoverlabel=dict(bgcolor="#ffffff", bordercolor=BORDER, font_size=12, font_color=TEXT),
+        xaxis=dict(showgrid=False, zeroline=False, tickfont=dict(color=MUTED, size=11)),
+        yaxis=dict(side="right", gridcolor="#ececf1", zeroline=False, tickfont=dict(color=MUTED, size=11)),
+    )
+    LEGEND_LAYOUT = dict(
+        showlegend=True,
+        margin=dict(l=12, r=12, t=44, b=12),
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1,
+            font=dict(color=MUTED, size=11),
+            bgcolor="rgba(0,0,0,0)",
+        ),
+    )
+    BAND_FILL = "rgba(0, 113, 227, 0.06)"
+    # 五線譜標準差線：(顏色, 名稱, 填色, 圖例順序)；-2SD 緊接 +2SD 以 tonexty 填出 2SD 通道
+    FIVE_LINES_BANDS = (
+        ("#c7c7cc", "+2SD", None, 1),
+        ("#c7c7cc", "-2SD", "tonexty", 4),
+        ("#b6b6bf", "+1SD", None, 2),
+        ("#b6b6bf", "-1SD", None, 3),
+    )
+    FG_GAUGE_STEPS = (
+        {"range": [0, 25], "color": "#fdecec"},
+        {"range": [25, 45], "color": "#fff4de"},
+        {"range": [45, 55], "color": "#ececf1"},
+        {"range": [55, 75], "color": "#e9f7ef"},
+        {"range": [75, 100], "color": "#dff3e7"},
+    )
+    # 市場情緒走勢的極端區參考線：與 add_hline 產生的 shape/annotation 相同，一次交給 update_layout
+    FG_SHAPES = (
+        {"type": "line", "xref": "x domain", "x0": 0, "x1": 1, "yref": "y", "y0": 25, "y1": 25,
+         "line": {"color": BORDER, "dash": "dot"}},
+        {"type": "line", "xref": "x domain", "x0": 0, "x1": 1, "yref": "y", "y0": 75, "y1": 75,
+         "line": {"color": BORDER, "dash": "dot"}},
+    )
+    FG_ANNOTATIONS = (
+        {"text": "Extreme Fear", "showarrow": False, "xref": "x domain", "x": 1, "xanchor": "right",
+         "yref": "y", "y": 25, "yanchor": "bottom"},
+        {"text": "Extreme Greed", "showarrow": False, "xref": "x domain", "x": 1, "xanchor": "right",
+         "yref": "y", "y": 75, "yanchor": "bottom"},
+    )
+    # 市場情緒「歷史數值」：(標籤, 資料欄位)
+    FG_HISTORY_FIELDS = (
+        ("前一交易日", "previous_close"),
+        ("一週前", "previous_1_week"),
+        ("一個月前", "previous_1_month"),
+        ("一年前", "previous_1_year"),
+    )
+
     @staticmethod
     def setup_page():
         st.set_page_config(page_title="股票智慧分析", page_icon="📈", layout="wide", initial_sidebar_state="collapsed")
-        st.markdown(
-            """
-            <style>
-            @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
-
-            :root {
-                --text: #1d1d1f;
-                --muted: #6e6e73;
-                --subtle: #86868b;
-                --border: #d8d8de;
-                --panel: #f5f5f7;
-                --panel-strong: #ececf1;
-                --blue: #0071e3;
-            }
-
-            html, body, [class*="css"], .stApp {
-                font-family: Inter, "Noto Sans TC", "PingFang TC", "Microsoft JhengHei", -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;
-                color: var(--text);
-                background: #ffffff;
-            }
-
-            header, [data-testid="stHeader"], .stAppHeader { display: none; }
-            .block-container {
-                max-width: 1120px;
-                padding: 76px 32px 56px !important;
-            }
-
-            .apple-nav {
-                position: fixed;
-                top: 0;
-                left: 0;
-                right: 0;
-                height: 52px;
-                background: rgba(255, 255, 255, 0.92);
-                border-bottom: 1px solid rgba(0, 0, 0, 0.08);
-                backdrop-filter: blur(18px);
-                -webkit-backdrop-filter: blur(18px);
-                z-index: 999999;
-                display: flex;
-                justify-content: center;
-                align-items: center;
-            }
-
-            .nav-list {
-                display: flex;
-                gap: 10px;
-                list-style: none;
-                margin: 0;
-                padding: 0;
-            }
-
-            .nav-item { position: relative; }
-            .nav-link {
-                display: flex;
-                align-items: center;
-                gap: 8px;
-                min-height: 36px;
-                padding: 0 14px;
-                border-radius: 10px;
-                color: var(--text) !important;
-                text-decoration: none !important;
-                font-size: 14px;
-                font-weight: 600;
-                transition: background 0.16s ease, color 0.16s ease;
-            }
-
-            .nav-item:hover .nav-link { background: var(--panel); color: #000 !important; }
-            .nav-link.active { background: var(--panel); color: #000 !important; }
-            .dropdown-item.active { background: var(--panel); color: #000 !important; font-weight: 700; }
-            .nav-kicker {
-                width: 7px;
-                height: 7px;
-                border-radius: 50%;
-                background: var(--blue);
-                opacity: 0.8;
-            }
-
-            .dropdown-menu {
-                position: absolute;
-                top: 43px;
-                left: 50%;
-                min-width: 220px;
-                padding: 8px;
-                border: 1px solid rgba(0, 0, 0, 0.08);
-                border-radius: 12px;
-                background: rgba(255, 255, 255, 0.98);
-                box-shadow: 0 18px 45px rgba(0, 0, 0, 0.11);
-                opacity: 0;
-                visibility: hidden;
-                transform: translate(-50%, -6px);
-                transition: opacity 0.16s ease, transform 0.16s ease, visibility 0.16s ease;
-            }
-
-            .nav-item:hover .dropdown-menu {
-                opacity: 1;
-                visibility: visible;
-                transform: translate(-50%, 0);
-            }
-
-            .dropdown-item {
-                display: block;
-                padding: 11px 12px;
-                border-radius: 8px;
-                color: var(--text) !important;
-                text-decoration: none !important;
-                font-size: 14px;
-                font-weight: 500;
-            }
-
-            .dropdown-item:hover { background: var(--panel); }
-
-            .main-title {
-                margin: 14px 0 8px;
-                color: var(--text);
-                text-align: center;
-                font-size: 44px;
-                font-weight: 700;
-                line-height: 1.08;
-            }
-
-            .sub-title {
-                margin: 0 auto 34px;
-                max-width: 680px;
-                color: var(--muted);
-                text-align: center;
-                font-size: 18px;
-                font-weight: 400;
-                line-height: 1.45;
-            }
-
-            .section-title {
-                margin: 28px 0 12px;
-                color: var(--text);
-                font-size: 20px;
-                font-weight: 700;
-            }
-
-            .panel {
-                padding: 20px;
-                border: 1px solid var(--border);
-                border-radius: 8px;
-                background: #fff;
-                box-shadow: 0 1px 2px rgba(0, 0, 0, 0.04);
-            }
-
-            .split-header {
-                display: flex;
-                justify-content: space-between;
-                gap: 24px;
-                align-items: flex-end;
-                padding-bottom: 20px;
-                margin-bottom: 22px;
-                border-bottom: 1px solid var(--border);
-            }
-
-            .stock-title {
-                margin: 0;
-                color: var(--text);
-                font-size: 38px;
-                font-weight: 700;
-                line-height: 1.1;
-            }
-
-            .meta-grid {
-                display: grid;
-                grid-template-columns: repeat(2, minmax(120px, 1fr));
-                gap: 12px;
-                text-align: right;
-            }
-
-            .meta-label {
-                color: var(--subtle);
-                font-size: 11px;
-                font-weight: 700;
-                letter-spacing: 0.06em;
-                text-transform: uppercase;
-            }
-
-            .meta-value {
-                margin-top: 4px;
-                color: var(--text);
-                font-size: 18px;
-                font-weight: 700;
-            }
-
-            .score-hero {
-                display: grid;
-                place-items: center;
-                margin: 4px 0 28px;
-                padding: 26px 16px;
-                border: 1px solid var(--border);
-                border-radius: 8px;
-                background: linear-gradient(180deg, #fff 0%, #f8f8fa 100%);
-            }
-
-            .score-label {
-                color: var(--subtle);
-                font-size: 12px;
-                font-weight: 700;
-                letter-spacing: 0.08em;
-                text-transform: uppercase;
-            }
-
-            .score-value {
-                margin-top: 4px;
-                font-size: 64px;
-                font-weight: 700;
-                line-height: 1;
-            }
-
-            .score-note {
-                margin-top: 8px;
-                color: var(--muted);
-                font-size: 13px;
-                font-weight: 500;
-            }
-
-            .metric-card {
-                min-height: 112px;
-                padding: 18px;
-                border: 1px solid var(--border);
-                border-radius: 8px;
-                background: #fff;
-                box-shadow: 0 1px 2px rgba(0, 0, 0, 0.04);
-                transition: box-shadow 0.16s ease, transform 0.16s ease;
-            }
-
-            .metric-card:hover {
-                box-shadow: 0 6px 18px rgba(0, 0, 0, 0.08);
-                transform: translateY(-2px);
-            }
-
-            .metric-card-label {
-                color: var(--muted);
-                font-size: 13px;
-                font-weight: 600;
-            }
-
-            .metric-card-value {
-                margin-top: 8px;
-                color: var(--text);
-                font-size: 28px;
-                font-weight: 700;
-                line-height: 1;
-            }
-
-            [data-testid="stMetric"] {
-                padding: 18px;
-                border: 1px solid var(--border);
-                border-radius: 8px;
-                background: #fff;
-            }
-
-            [data-testid="stMetricLabel"] p {
-                color: var(--muted) !important;
-                font-size: 12px !important;
-                font-weight: 700 !important;
-                letter-spacing: 0.06em;
-                text-transform: uppercase;
-            }
-
-            [data-testid="stMetricValue"] {
-                color: var(--text) !important;
-                font-size: 26px !important;
-                font-weight: 700 !important;
-            }
-
-            .stTextInput input {
-                height: 46px;
-                border: 1px solid var(--border) !important;
-                border-radius: 8px !important;
-                background: #fff !important;
-                color: var(--text) !important;
-                box-shadow: none !important;
-                text-align: center;
-                font-weight: 500;
-            }
-
-            .stTextInput input:focus {
-                border-color: var(--blue) !important;
-                box-shadow: 0 0 0 3px rgba(0, 113, 227, 0.12) !important;
-            }
-
-            .stTabs [data-baseweb="tab-list"] {
-                gap: 8px;
-                border-bottom: 1px solid var(--border);
-            }
-
-            .stTabs [data-baseweb="tab"] {
-                height: 42px;
-                border-radius: 8px 8px 0 0;
-                padding: 0 12px;
-            }
-
-            .stTabs [aria-selected="true"] {
-                background: var(--panel);
-            }
-
-            .stTabs [data-baseweb="tab"] p {
-                color: var(--text) !important;
-                font-size: 14px;
-                font-weight: 600 !important;
-            }
-
-            [data-testid="stDataFrame"] {
-                overflow: hidden;
-                border: 1px solid var(--border);
-                border-radius: 8px;
-                background: #fff;
-            }
-
-            [data-testid="stDataFrame"] div[role="grid"] {
-                border: none !important;
-            }
-
-            .soft-message {
-                margin-top: 20px;
-                padding: 22px;
-                border: 1px solid var(--border);
-                border-radius: 8px;
-                background: var(--panel);
-                text-align: center;
-            }
-
-            .soft-message-title {
-                margin: 0;
-                color: var(--text);
-                font-size: 17px;
-                font-weight: 700;
-            }
-
-            .soft-message-copy {
-                margin: 7px 0 0;
-                color: var(--muted);
-                font-size: 14px;
-            }
-
-            @media (max-width: 760px) {
-                .block-container { padding: 70px 18px 36px !important; }
-                .nav-list { gap: 2px; }
-                .nav-link { padding: 0 9px; font-size: 12px; }
-                .main-title { font-size: 34px; }
-                .sub-title { font-size: 16px; margin-bottom: 24px; }
-                .split-header { display: block; }
-                .stock-title { font-size: 30px; margin-bottom: 18px; }
-                .meta-grid { text-align: left; }
-                .score-value { font-size: 52px; }
-            }
-            </style>
-            """,
-            unsafe_allow_html=True,
-        )
+        # 樣式與導覽列都是靜態 HTML：以 st.html 直接插入 DOM，不經 markdown 解析
+        st.html(_app_css())
 
     @staticmethod
     def render_apple_nav(current_page="individual"):
-        # 目前頁面所屬的導覽分類，用來高亮標示
-        active_cat = {
-            "individual": "technical",
-            "financials_six_index": "financials",
-            "financials_overview": "financials",
-            "economy": "economy",
-        }.get(current_page, "")
-
-        def nav(cat):
-            return "nav-link active" if cat == active_cat else "nav-link"
-
-        def item(page):
-            return "dropdown-item active" if page == current_page else "dropdown-item"
-
-        st.markdown(
-            f"""
-            <div class="apple-nav">
-                <ul class="nav-list">
-                    <li class="nav-item">
-                        <a class="{nav('technical')}" href="#"><span class="nav-kicker"></span>技術面</a>
-                        <div class="dropdown-menu">
-                            <a href="?page=individual" target="_self" class="{item('individual')}">樂活五線譜</a>
-                        </div>
-                    </li>
-                    <li class="nav-item">
-                        <a class="{nav('financials')}" href="#"><span class="nav-kicker"></span>財務面</a>
-                        <div class="dropdown-menu">
-                             <a href="?page=financials_six_index" target="_self" class="{item('financials_six_index')}">六大指標評分</a>
-                             <a href="?page=financials_overview" target="_self" class="{item('financials_overview')}">財務總覽</a>
-                        </div>
-                    </li>
-                    <li class="nav-item">
-                        <a class="{nav('economy')}" href="#"><span class="nav-kicker"></span>總經面</a>
-                        <div class="dropdown-menu">
-                            <a href="?page=economy" target="_self" class="{item('economy')}">Fear &amp; Greed Index</a>
-                        </div>
-                    </li>
-                </ul>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
+        st.html(_nav_html(current_page if current_page in _NAV_CATEGORIES else ""))
 
     @staticmethod
     def render_header(title="股票智慧分析", subtitle=None):
-        st.markdown(f'<h1 class="main-title">{html.escape(title)}</h1>', unsafe_allow_html=True)
+        st.html(f'<h1 class="main-title">{html.escape(title)}</h1>')
         if subtitle:
-            st.markdown(f'<p class="sub-title">{html.escape(subtitle)}</p>', unsafe_allow_html=True)
+            st.html(f'<p class="sub-title">{html.escape(subtitle)}</p>')
 
     @staticmethod
     def render_search_input() -> str:
@@ -445,9 +286,15 @@ class AppView:
             )
 
     @staticmethod
-    def render_metrics(current_price: float, ticker: str, last_date: str):
+    def format_metrics(current_price: float, ticker: str, last_date: str) -> tuple[str, str, str]:
+        """頁首三個指標的顯示字串；與 LOHAS 計算結果一起快取，rerun 時直接沿用。"""
+        return f"{current_price:.2f} 元", str(ticker), last_date
+
+    @staticmethod
+    def render_metrics(metrics: tuple[str, str, str]):
+        price, ticker, last_date = metrics
         c1, c2, c3 = st.columns(3)
-        c1.metric("最新股價", f"{current_price:.2f} 元")
+        c1.metric("最新股價", price)
         c2.metric("股票代號", ticker)
         c3.metric("資料日期", last_date)
 
@@ -463,33 +310,16 @@ class AppView:
 
     @classmethod
     def _section_title(cls, title: str):
-        st.markdown(f'<h2 class="section-title">{html.escape(title)}</h2>', unsafe_allow_html=True)
+        st.html(f'<h2 class="section-title">{html.escape(title)}</h2>')
 
     @classmethod
     def _chart_layout(cls, fig: go.Figure, height: int = 430, y_range: list[int] | None = None):
-        fig.update_layout(
-            height=height,
-            showlegend=False,
-            plot_bgcolor="#ffffff",
-            paper_bgcolor="#ffffff",
-            margin=dict(l=12, r=12, t=24, b=12),
-            font=dict(family=cls.FONT, color=cls.TEXT, size=12),
-            hovermode="x unified",
-            hoverlabel=dict(bgcolor="#ffffff", bordercolor=cls.BORDER, font_size=12, font_color=cls.TEXT),
-            xaxis=dict(showgrid=False, zeroline=False, tickfont=dict(color=cls.MUTED, size=11)),
-            yaxis=dict(
-                side="right",
-                gridcolor="#ececf1",
-                zeroline=False,
-                tickfont=dict(color=cls.MUTED, size=11),
-                range=y_range,
-            ),
-        )
+        fig.update_layout(cls.CHART_LAYOUT, height=height, yaxis_range=y_range)
         return fig
 
     @classmethod
-    def _plot(cls, fig: go.Figure):
-        st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False, "responsive": True})
+    def _plot(cls, fig: go.Figure | dict):
+        st.plotly_chart(fig, use_container_width=True, config=cls.PLOT_CONFIG)
 
     @classmethod
     def _render_table(
@@ -529,13 +359,13 @@ class AppView:
     @classmethod
     def _add_price_marker(cls, fig, stock_data, ref_series):
         """在最新一點標出現價圓點；低於參考線(趨勢/均線)偏綠(相對便宜)、高於偏紅(相對昂貴)。"""
-        last_x = stock_data.index[-1]
         last_close = stock_data["close"].iloc[-1]
         ref_last = ref_series.iloc[-1]
         color = cls.TEXT if pd.isna(ref_last) else (cls.GREEN if last_close < ref_last else cls.RED)
         fig.add_trace(
             go.Scatter(
-                x=[last_x],
+                # 以 index 切片傳入（datetime64），不放 Timestamp 物件，Plotly 才能走 orjson 直通序列化
+                x=stock_data.index[-1:],
                 y=[last_close],
                 mode="markers",
                 name="現價",
@@ -545,53 +375,63 @@ class AppView:
             )
         )
 
+    @staticmethod
+    def _f32(values) -> np.ndarray:
+        """圖表 y 值轉 float32：Plotly 以二進位型別陣列傳送，位元組數減半，股價精度不受影響。"""
+        return np.asarray(values, dtype=np.float32)
+
+    @classmethod
+    def _figure_key(cls, stock_data) -> tuple:
+        """圖表快取鍵：代號、最後日期、筆數與最新收盤價；資料沒變就沿用上次建好的圖。"""
+        if stock_data.empty:
+            return (cls._ui_revision(stock_data), None, 0, None)
+        return (cls._ui_revision(stock_data), str(stock_data.index[-1]), len(stock_data), float(stock_data["close"].iloc[-1]))
+
+    @staticmethod
+    def _history_key(ticker: str, history_df: pd.DataFrame) -> tuple:
+        """歷史評分快取鍵：代號、筆數與最新一期（DB 依月份新到舊排序）；新增月份或最新一期重新評分時才重新整理。"""
+        return (str(ticker), len(history_df), tuple(history_df.iloc[0].astype(str)))
+
+    @staticmethod
+    def _ui_revision(stock_data) -> str:
+        """以股票代號作為 uirevision：rerun 時保留使用者的縮放/平移，換股票時才重置。"""
+        if "stock_id" in stock_data.columns and not stock_data.empty:
+            return str(stock_data["stock_id"].iloc[0])
+        return "stock"
+
     @classmethod
     def _enable_legend(cls, fig):
         """開啟頂端水平圖例，讓各條線一目了然。"""
-        fig.update_layout(
-            showlegend=True,
-            margin=dict(l=12, r=12, t=44, b=12),
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1,
-                font=dict(color=cls.MUTED, size=11),
-                bgcolor="rgba(0,0,0,0)",
-            ),
-        )
+        fig.update_layout(cls.LEGEND_LAYOUT)
         return fig
 
     @classmethod
     def render_five_lines_chart(cls, stock_data, lines_data: dict):
-        hover = "<b>%{fullData.name}</b>: %{y:.2f}<extra></extra>"
+        cls._plot(_cached_figure("five_lines", cls._figure_key(stock_data), (stock_data, lines_data)))
+
+    @classmethod
+    def _build_five_lines_fig(cls, stock_data, lines_data: dict) -> go.Figure:
+        hover = cls.HOVER
         fig = go.Figure()
-        fig.add_trace(
-            go.Scatter(
-                x=stock_data.index.tolist() + stock_data.index.tolist()[::-1],
-                y=lines_data["lines"]["+2SD"].tolist() + lines_data["lines"]["-2SD"].tolist()[::-1],
-                fill="toself",
-                fillcolor="rgba(0, 113, 227, 0.06)",
-                line=dict(color="rgba(0,0,0,0)"),
-                hoverinfo="skip",
-                showlegend=False,
-            )
-        )
-        for color, name in [("#c7c7cc", "+2SD"), ("#b6b6bf", "+1SD"), ("#b6b6bf", "-1SD"), ("#c7c7cc", "-2SD")]:
+        # -2SD 緊接在 +2SD 之後並以 tonexty 填色，兩條線之間即為 2SD 通道，不必另外送一條 2N 點的多邊形；
+        # legendrank 讓圖例仍依 +2SD、+1SD、-1SD、-2SD 排列
+        for color, name, fill, rank in cls.FIVE_LINES_BANDS:
             fig.add_trace(
                 go.Scatter(
                     x=stock_data.index,
-                    y=lines_data["lines"][name],
+                    y=cls._f32(lines_data["lines"][name]),
                     name=name,
                     line=dict(color=color, width=1.1),
+                    fill=fill,
+                    fillcolor=cls.BAND_FILL if fill else None,
+                    legendrank=rank,
                     hovertemplate=hover,
                 )
             )
         fig.add_trace(
             go.Scatter(
                 x=stock_data.index,
-                y=lines_data["lines"]["Trend"],
+                y=cls._f32(lines_data["lines"]["Trend"]),
                 name="趨勢線",
                 line=dict(color=cls.BLUE, width=1.4, dash="dot"),
                 hovertemplate=hover,
@@ -600,23 +440,28 @@ class AppView:
         fig.add_trace(
             go.Scatter(
                 x=stock_data.index,
-                y=stock_data["close"],
+                y=cls._f32(stock_data["close"]),
                 name="收盤價",
                 line=dict(color=cls.TEXT, width=2.4),
                 hovertemplate=hover,
             )
         )
         cls._add_price_marker(fig, stock_data, lines_data["lines"]["Trend"])
-        cls._plot(cls._enable_legend(cls._chart_layout(fig)))
+        fig.update_layout(uirevision=cls._ui_revision(stock_data))
+        return cls._enable_legend(cls._chart_layout(fig))
 
     @classmethod
     def render_channel_chart(cls, stock_data, channel_data: dict):
-        hover = "<b>%{fullData.name}</b>: %{y:.2f}<extra></extra>"
+        cls._plot(_cached_figure("channel", cls._figure_key(stock_data), (stock_data, channel_data)))
+
+    @classmethod
+    def _build_channel_fig(cls, stock_data, channel_data: dict) -> go.Figure:
+        hover = cls.HOVER
         fig = go.Figure()
         fig.add_trace(
             go.Scatter(
                 x=stock_data.index,
-                y=channel_data["lines"]["Top"],
+                y=cls._f32(channel_data["lines"]["Top"]),
                 name="上通道",
                 line=dict(color=cls.BLUE, width=1.4),
                 hovertemplate=hover,
@@ -625,10 +470,10 @@ class AppView:
         fig.add_trace(
             go.Scatter(
                 x=stock_data.index,
-                y=channel_data["lines"]["Bottom"],
+                y=cls._f32(channel_data["lines"]["Bottom"]),
                 name="下通道",
                 fill="tonexty",
-                fillcolor="rgba(0, 113, 227, 0.06)",
+                fillcolor=cls.BAND_FILL,
                 line=dict(color=cls.BLUE, width=1.4),
                 hovertemplate=hover,
             )
@@ -636,7 +481,7 @@ class AppView:
         fig.add_trace(
             go.Scatter(
                 x=stock_data.index,
-                y=channel_data["lines"]["20W MA"],
+                y=cls._f32(channel_data["lines"]["20W MA"]),
                 name="20週均線",
                 line=dict(color="#9b9ba5", width=1.2, dash="dash"),
                 hovertemplate=hover,
@@ -645,14 +490,15 @@ class AppView:
         fig.add_trace(
             go.Scatter(
                 x=stock_data.index,
-                y=stock_data["close"],
+                y=cls._f32(stock_data["close"]),
                 name="收盤價",
                 line=dict(color=cls.TEXT, width=2.4),
                 hovertemplate=hover,
             )
         )
         cls._add_price_marker(fig, stock_data, channel_data["lines"]["20W MA"])
-        cls._plot(cls._enable_legend(cls._chart_layout(fig)))
+        fig.update_layout(uirevision=cls._ui_revision(stock_data))
+        return cls._enable_legend(cls._chart_layout(fig))
 
     @staticmethod
     def render_tabs(stock_data, five_lines_data: dict, channel_data: dict):
@@ -664,19 +510,23 @@ class AppView:
 
     @classmethod
     def render_not_found_message(cls, search_term: str):
-        st.markdown(
-            f"""
-            <div class="soft-message">
-                <p class="soft-message-title">找不到「{cls._html(search_term)}」</p>
-                <p class="soft-message-copy">請確認股票代號或公司名稱後再試一次。</p>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
+        st.html(_NOT_FOUND_PREFIX + cls._html(search_term) + _NOT_FOUND_SUFFIX)
+
+    @classmethod
+    def prepare_overview(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """加上財務總覽的搜尋欄位（代號字串、小寫名稱）；與總覽資料一起快取，每次輸入不必整欄轉型。"""
+        id_col = cls._first_existing(df, ["代號", "stock_id"])
+        name_col = cls._first_existing(df, ["名稱", "stock_name"])
+        extra = {}
+        if id_col:
+            extra["_id_str"] = df[id_col].astype("string").str.lower()
+        if name_col:
+            extra["_name_lc"] = df[name_col].astype("string").str.lower()
+        return df.assign(**extra) if extra else df
 
     @classmethod
     def render_financial_overview(cls, df: pd.DataFrame):
-        st.markdown('<h1 class="main-title">財務總覽</h1>', unsafe_allow_html=True)
+        st.html('<h1 class="main-title">財務總覽</h1>')
 
         if df.empty:
             st.info("目前沒有財務資料。")
@@ -690,19 +540,52 @@ class AppView:
                 label_visibility="collapsed",
             )
 
-        display_df = df.copy()
-        id_col = cls._first_existing(display_df, ["代號", "stock_id"])
-        name_col = cls._first_existing(display_df, ["名稱", "stock_name"])
+        # 搜尋欄位通常已由快取的載入函式加好（見 prepare_overview），未經快取的呼叫才在這裡補上；
+        # 不先整張 copy：布林篩選與 assign 都會回傳新的 DataFrame，不會改到傳入的 df
+        display_df = df if "_id_str" in df.columns else cls.prepare_overview(df)
+        id_col = cls._first_existing(display_df, ["_id_str"])
+        name_col = cls._first_existing(display_df, ["_name_lc"])
         level_col = cls._first_existing(display_df, ["樂活五線譜"])
 
         if search_query and id_col:
-            mask = display_df[id_col].astype(str).str.contains(search_query, case=False, na=False)
+            # 欄位已預先轉小寫，只需把查詢字串轉小寫；regex=False 以字面字串比對，不必每次輸入都編譯正規表示式
+            q = search_query.lower()
+            mask = display_df[id_col].str.contains(q, regex=False, na=False).to_numpy()
             if name_col:
-                mask = mask | display_df[name_col].astype(str).str.contains(search_query, case=False, na=False)
-            display_df = display_df[mask]
+                mask = mask | display_df[name_col].str.contains(q, regex=False, na=False).to_numpy()
+            display_df = display_df.loc[mask]
+
+        # 分頁：只把目前這一頁送到前端，後續的格式化也只處理這一頁
+        page_size = cls.OVERVIEW_PAGE_SIZE
+        total = len(display_df)
+        if total > page_size:
+            n_pages = -(-total // page_size)
+            present = set(display_df.columns)
+            sort_labels = [label for label, col in cls.OVERVIEW_SORT_OPTIONS.items() if col in present]
+            sort_col, order_col, page_col = st.columns([2, 1, 2], vertical_alignment="bottom")
+            with sort_col:
+                sort_label = st.selectbox("排序（套用至全部結果）", sort_labels, key="overview_sort")
+            with order_col:
+                descending = st.toggle("由高到低", key="overview_sort_desc")
+            with page_col:
+                # 不指定 key：篩選結果或排序改變時標籤跟著變，頁碼自動回到第 1 頁
+                order = "由高到低" if descending else "由低到高"
+                page = int(st.number_input(
+                    f"頁數（依{sort_label}{order}，共 {n_pages} 頁、{total} 筆）",
+                    min_value=1, max_value=n_pages, value=1, step=1,
+                ))
+            # 先對整份篩選結果排序再切頁，排名才會跨頁正確；穩定排序讓同分者維持代號順序
+            display_df = display_df.sort_values(
+                cls.OVERVIEW_SORT_OPTIONS[sort_label], ascending=not descending, kind="stable", na_position="last"
+            )
+            display_df = display_df.iloc[(page - 1) * page_size : page * page_size]
 
         if level_col:
-            display_df[level_col] = display_df[level_col].apply(lambda x: str(int(x)) if pd.notnull(x) else "-")
+            # 位階整欄一次轉成整數字串，缺值顯示 "-"（取代逐列 apply）
+            level = display_df[level_col]
+            display_df = display_df.assign(
+                **{level_col: np.where(level.notna(), level.fillna(0).astype("int64").astype(str), "-")}
+            )
 
         rename_map = {
             "總分": "綜合評分",
@@ -714,7 +597,7 @@ class AppView:
             "存貨周轉率評分": "存貨周轉",
             "自由現金流量評分": "自由現金流",
         }
-        display_df = display_df.rename(columns={k: v for k, v in rename_map.items() if k in display_df.columns})
+        display_df = display_df.rename(columns=rename_map)
 
         preferred = [
             "代號",
@@ -731,77 +614,51 @@ class AppView:
             "財報季度",
             "營收月份",
         ]
-        cols = [c for c in preferred if c in display_df.columns] + [c for c in display_df.columns if c not in preferred]
+        # 底線開頭為內部搜尋用欄位，不顯示
+        present, preferred_set = set(display_df.columns), set(preferred)
+        cols = [c for c in preferred if c in present] + [
+            c for c in display_df.columns if c not in preferred_set and not c.startswith("_")
+        ]
         display_df = display_df[cols]
 
-        numeric_score_cols = ["綜合評分", "月營收", "營業利益率", "淨利成長", "EPS", "自由現金流"]
-        column_config = {
-            "代號": st.column_config.TextColumn("代號", width="small"),
-            "名稱": st.column_config.TextColumn("名稱", width="medium"),
-            "產業": st.column_config.TextColumn("產業", width="medium"),
-            "綜合評分": st.column_config.NumberColumn("綜合評分", format="%.2f", width="small"),
-            "樂活位階": st.column_config.TextColumn("樂活位階", width="small"),
-        }
-        for col_name in numeric_score_cols:
-            if col_name not in column_config:
-                column_config[col_name] = st.column_config.NumberColumn(col_name, format="%.2f", width="small")
-
-        cls._render_table(display_df, height=650, column_config=column_config)
+        cls._render_table(display_df, height=650, column_config=cls.OVERVIEW_COLUMN_CONFIG)
 
     @classmethod
     def render_economy_page(cls, data: dict):
-        st.markdown('<h1 class="main-title">市場情緒</h1>', unsafe_allow_html=True)
-        st.markdown('<p class="sub-title">CNN Fear &amp; Greed Index</p>', unsafe_allow_html=True)
+        st.html('<h1 class="main-title">市場情緒</h1>')
+        st.html('<p class="sub-title">CNN Fear &amp; Greed Index</p>')
 
         tab1, tab2 = st.tabs(["總覽", "歷史走勢"])
         with tab1:
             col1, col2 = st.columns([2, 1])
             with col1:
                 cls.render_fear_greed_gauge(data["current_score"], data["current_rating"])
-                st.markdown(
-                    f'<p style="color:#86868b;font-size:12px;text-align:center;">資料更新於 {cls._html(data["last_updated"])}</p>',
-                    unsafe_allow_html=True,
-                )
+                st.html(f'<p style="color:#86868b;font-size:12px;text-align:center;">資料更新於 {cls._html(data["last_updated"])}</p>')
             with col2:
                 cls._section_title("歷史數值")
-                for label, value in [
-                    ("前一交易日", data["previous_close"]),
-                    ("一週前", data["previous_1_week"]),
-                    ("一個月前", data["previous_1_month"]),
-                    ("一年前", data["previous_1_year"]),
-                ]:
-                    rating = "Neutral"
-                    if value <= 25:
-                        rating = "Extreme Fear"
-                    elif value <= 45:
-                        rating = "Fear"
-                    elif value <= 55:
-                        rating = "Neutral"
-                    elif value <= 75:
-                        rating = "Greed"
-                    else:
-                        rating = "Extreme Greed"
-                    color = cls.GREEN if "Greed" in rating else cls.RED if "Fear" in rating else cls.TEXT
-                    st.markdown(
-                        f"""
-                        <div class="metric-card" style="min-height:auto;margin-bottom:10px;">
-                            <div style="display:flex;justify-content:space-between;gap:12px;align-items:center;">
-                                <div>
-                                    <div class="metric-card-label">{cls._html(label)}</div>
-                                    <div style="margin-top:4px;font-weight:700;color:{color};">{rating}</div>
-                                </div>
-                                <div style="font-size:24px;font-weight:700;color:{color};">{int(value)}</div>
-                            </div>
-                        </div>
-                        """,
-                        unsafe_allow_html=True,
+                labels = [label for label, _ in cls.FG_HISTORY_FIELDS]
+                values = [data[key] for _, key in cls.FG_HISTORY_FIELDS]
+                # 一次分級四個數值（區間右端含等號：≤25 極度恐懼、≤45 恐懼…）
+                ratings = pd.cut(values, _FG_BINS, labels=_FG_RATINGS)
+                # 四列合成一段 HTML，一次送出
+                st.html(
+                    "".join(
+                        _FG_ROW_TEMPLATE.format(
+                            label=cls._html(label), rating=rating, color=cls.FG_RATING_COLORS[rating], value=int(value)
+                        )
+                        for label, value, rating in zip(labels, values, ratings)
                     )
+                )
 
         with tab2:
             cls.render_fear_greed_timeline(data["historical_data"])
 
     @classmethod
     def render_fear_greed_gauge(cls, score: float, rating: str):
+        cls._plot(_cached_figure("fear_greed_gauge", (score, rating), (score, rating)))
+
+    @classmethod
+    def _build_fear_greed_gauge_fig(cls, score: float, rating: str) -> go.Figure:
         fig = go.Figure(
             go.Indicator(
                 mode="gauge+number",
@@ -813,13 +670,7 @@ class AppView:
                     "bar": {"color": cls.TEXT, "thickness": 0.16},
                     "bgcolor": "white",
                     "borderwidth": 0,
-                    "steps": [
-                        {"range": [0, 25], "color": "#fdecec"},
-                        {"range": [25, 45], "color": "#fff4de"},
-                        {"range": [45, 55], "color": "#ececf1"},
-                        {"range": [55, 75], "color": "#e9f7ef"},
-                        {"range": [75, 100], "color": "#dff3e7"},
-                    ],
+                    "steps": cls.FG_GAUGE_STEPS,
                     "threshold": {
                         "line": {"color": cls.TEXT, "width": 4},
                         "thickness": 0.74,
@@ -834,10 +685,16 @@ class AppView:
             font={"color": cls.TEXT, "family": cls.FONT},
             margin=dict(l=16, r=16, t=50, b=12),
         )
-        cls._plot(fig)
+        return fig
 
     @classmethod
     def render_fear_greed_timeline(cls, df: pd.DataFrame):
+        # 指數每日更新一次：筆數、首末日期與最新分數相同即沿用快取的圖
+        key = (len(df), str(df["date"].iloc[0]), str(df["date"].iloc[-1]), float(df["score"].iloc[-1])) if len(df) else (0,)
+        cls._plot(_cached_figure("fear_greed_timeline", key, (df,)))
+
+    @classmethod
+    def _build_fear_greed_timeline_fig(cls, df: pd.DataFrame) -> go.Figure:
         fig = go.Figure()
         fig.add_trace(
             go.Scatter(
@@ -848,11 +705,8 @@ class AppView:
                 hovertemplate="Score: %{y:.0f}<extra></extra>",
             )
         )
-        for val, label in [(25, "Extreme Fear"), (75, "Extreme Greed")]:
-            fig.add_hline(y=val, line_dash="dot", line_color=cls.BORDER, annotation_text=label)
-
-        fig = cls._chart_layout(fig, height=430, y_range=[0, 100])
-        cls._plot(fig)
+        fig.update_layout(shapes=cls.FG_SHAPES, annotations=cls.FG_ANNOTATIONS)
+        return cls._chart_layout(fig, height=430, y_range=[0, 100])
 
     @classmethod
     def render_financial_dashboard(
@@ -868,7 +722,10 @@ class AppView:
         quarter = cls._safe_get(results, ["財報季度"])
         revenue_month = cls._safe_get(results, ["營收月份"])
 
-        st.markdown(
+        total_score = cls._safe_get(results, ["總分", "本期綜合評分"])
+        score_color = cls._score_color(total_score)
+        # 標題列與綜合評分合成一段 HTML 送出
+        st.html(
             f"""
             <div class="split-header">
                 <h1 class="stock-title">{cls._html(display_title)}</h1>
@@ -883,20 +740,11 @@ class AppView:
                     </div>
                 </div>
             </div>
-            """,
-            unsafe_allow_html=True,
-        )
-
-        total_score = cls._safe_get(results, ["總分", "本期綜合評分"])
-        score_color = cls._score_color(total_score)
-        st.markdown(
-            f"""
             <div class="score-hero">
                 <div class="score-label">綜合評分</div>
                 <div class="score-value" style="color:{score_color};">{cls._html(total_score)}</div>
             </div>
-            """,
-            unsafe_allow_html=True,
+            """
         )
 
         metrics_map = [
@@ -912,20 +760,25 @@ class AppView:
             val = cls._safe_get(results, keys)
             color = cls._score_color(val)
             with cols[idx % 3]:
-                st.markdown(
+                st.html(
                     f"""
                     <div class="metric-card">
                         <div class="metric-card-label">{label}</div>
                         <div class="metric-card-value" style="color:{color};">{cls._html(val)}</div>
                     </div>
-                    """,
-                    unsafe_allow_html=True,
+                    """
                 )
             if idx == 2:
                 cols = st.columns(3)
 
-        st.markdown('<div style="height:28px;"></div>', unsafe_allow_html=True)
-        tabs = st.tabs(["月營收", "營業利益率", "淨利成長率", "EPS", "存貨周轉率", "自由現金流量"])
+        # 以單選切換明細表：只有目前選取的那張表會序列化送到前端（st.tabs 會把六張表全部送出）
+        active = st.radio(
+            "財務明細",
+            [spec[0] for spec in cls.FINANCIAL_TABLES],
+            horizontal=True,
+            label_visibility="collapsed",
+            key="financial_detail_table",
+        )
 
         def render_df(df: pd.DataFrame | None, candidates: list[list[str]], names: list[str], empty_msg: str):
             if df is None or df.empty:
@@ -935,73 +788,32 @@ class AppView:
             if any(col is None for col in selected):
                 st.info(empty_msg)
                 return
-            table = df[selected].copy()
-            table.columns = names
+            # df[selected] 已是新物件，set_axis 直接換欄名，不必再整張 copy
+            table = df[selected].set_axis(names, axis=1)
             config = {name: st.column_config.NumberColumn(name, format="%.2f") for name in names if name not in ["月份", "季度"]}
             cls._render_table(table, column_config=config)
 
-        with tabs[0]:
-            render_df(
-                raw_data.get("revenue"),
-                [["date"], ["revenue"], ["yoy"]],
-                ["月份", "營收(千元)", "年增率(%)"],
-                "查無營收資料。",
-            )
-        with tabs[1]:
-            render_df(
-                raw_data.get("profitability"),
-                [["quarter"], ["營業利益率"]],
-                ["季度", "營業利益率(%)"],
-                "查無營業利益率資料。",
-            )
-        with tabs[2]:
-            render_df(
-                raw_data.get("profitability"),
-                [["quarter"], ["稅後淨利成長率", "稅後淨利年增率"]],
-                ["季度", "淨利成長率(%)"],
-                "查無淨利成長資料。",
-            )
-        with tabs[3]:
-            render_df(
-                raw_data.get("profitability"),
-                [["quarter"], ["每股盈餘", "每股盈餘EPS"]],
-                ["季度", "EPS(元)"],
-                "查無 EPS 資料。",
-            )
-        with tabs[4]:
-            render_df(
-                raw_data.get("profitability"),
-                [["quarter"], ["存貨週轉率(次)", "存貨周轉率"]],
-                ["季度", "存貨周轉率"],
-                "查無存貨周轉率資料。",
-            )
-        with tabs[5]:
-            render_df(
-                raw_data.get("cashflow"),
-                [["quarter"], ["fcf"]],
-                ["季度", "自由現金流量"],
-                "查無現金流量資料。",
-            )
+        for label, source, candidates, names, empty_msg in cls.FINANCIAL_TABLES:
+            if label == active:
+                render_df(raw_data.get(source), candidates, names, empty_msg)
+                break
 
         if lohas_bundle:
             cls._section_title("樂活技術分析")
-            l_tab1, l_tab2 = st.tabs(["樂活五線譜", "樂活通道"])
-            with l_tab1:
-                cls.render_five_lines_chart(lohas_bundle["stock_data"], lohas_bundle["five_lines_data"])
-            with l_tab2:
-                cls.render_channel_chart(lohas_bundle["stock_data"], lohas_bundle["channel_data"])
+            # 與個股頁共用 render_tabs，圖表也命中同一份 _cached_figure 快取
+            cls.render_tabs(lohas_bundle["stock_data"], lohas_bundle["five_lines_data"], lohas_bundle["channel_data"])
 
         if history_df is not None and not history_df.empty:
             cls._section_title("歷史評分走勢")
-            month_col = cls._first_existing(history_df, ["營收月份", "Month"])
-            score_col = cls._first_existing(history_df, ["本期綜合評分", "總分", "Total Score"])
-            if month_col and score_col:
-                hist_plot = history_df.sort_values(month_col)
+            hist_plot, hist_table = _prepare_history(cls._history_key(ticker, history_df), history_df)
+            if hist_plot is not None:
+                month_col, score_col = hist_plot.columns
                 fig = go.Figure()
                 fig.add_trace(
                     go.Scatter(
-                        x=hist_plot[month_col],
-                        y=hist_plot[score_col],
+                        # 月份字串轉成 list：pandas 字串欄會變成 object ndarray，orjson 無法直接序列化而退回逐值清理的慢路徑
+                        x=hist_plot[month_col].tolist(),
+                        y=hist_plot[score_col].to_numpy(),
                         mode="lines+markers",
                         name="綜合評分",
                         line=dict(color=cls.BLUE, width=2.6),
@@ -1013,25 +825,4 @@ class AppView:
                 fig.update_xaxes(type="category")
                 cls._plot(fig)
 
-            rename_map = {
-                "營收月份": "營收月份",
-                "財報季度": "財報季度",
-                "本期綜合評分": "綜合評分",
-                "綜合評分變化": "評分變化",
-                "營收年增率": "月營收",
-                "營業利益率": "營業利益率",
-                "稅後淨利年增率": "淨利成長",
-                "每股盈餘EPS": "EPS",
-                "存貨周轉率": "存貨周轉",
-                "自由現金流量": "自由現金流",
-            }
-            final_hist_df = history_df.rename(columns={k: v for k, v in rename_map.items() if k in history_df.columns})
-            preferred = ["營收月份", "財報季度", "綜合評分", "評分變化", "月營收", "營業利益率", "淨利成長", "EPS", "存貨周轉", "自由現金流"]
-            cols = [c for c in preferred if c in final_hist_df.columns]
-            cls._render_table(
-                final_hist_df[cols] if cols else final_hist_df,
-                column_config={
-                    "綜合評分": st.column_config.NumberColumn("綜合評分", format="%.2f", width="small"),
-                    "評分變化": st.column_config.NumberColumn("評分變化", format="%+.2f"),
-                },
-            )
+            cls._render_table(hist_table, column_config=cls.HISTORY_COLUMN_CONFIG)